@@ -2,20 +2,32 @@ import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 from functools import lru_cache
+from typing import Literal, Optional
 
 BASE_DIR = Path(__file__).resolve().parent
 
 class Settings(BaseSettings):
     openai_api_key: str
+    openai_base_url: Optional[str] = None
     embedding_model: str = "text-embedding-3-small"
     gpt_model: str = "gpt-3.5-turbo"
     index_path: str = "faiss_index/"
+    index_file: str = "faiss_index/index.faiss"
+    # Open indexes memory-mapped and read-only so uvicorn workers share one copy
+    index_mmap: bool = True
     chunks_file: str = "app/data/chunks.json"
     chunks_path: str = "app/data/"
     secret_key: str = "super-secret"
     algorithm: str = "HS256"
     access_token_expires_minutes: int
     database_url: str
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+    # "all" serves everything; "api" serves auth/users/reviewer; "ingest" serves /upload only
+    worker_role: Literal["all", "api", "ingest"] = "all"
+    # Import heavy libraries and build the OpenAI client in the lifespan hook
+    # instead of on the first request
+    preload_on_startup: bool = True
     model_config = SettingsConfigDict(env_file=".env")
 
 
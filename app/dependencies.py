@@ -1,4 +1,3 @@
-from openai import OpenAI
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from datetime import datetime, timedelta, timezone
@@ -8,10 +7,9 @@ from app.models import User
 from app.database import get_session
 import jwt
 from jwt.exceptions import InvalidTokenError
+from functools import lru_cache
 from app.config import SETTINGS
 
-client = OpenAI(api_key=SETTINGS.openai_api_key)
-
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -41,8 +39,11 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SETTINGS.secret_key, algorithm=SETTINGS.algorithm)
 
+@lru_cache
 def get_openai_client():
-    return client
+    # Built on first use so importing the app does not pay for the openai package.
+    from openai import OpenAI
+    return OpenAI(api_key=SETTINGS.openai_api_key, base_url=SETTINGS.openai_base_url)
 
 async def get_current_user(
     security_scopes: SecurityScopes,
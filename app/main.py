@@ -1,14 +1,51 @@
 from fastapi import FastAPI
-from app.routers import auth, reviewer, users, upload
+from app.routers import metrics
 from app.database import create_db_and_tables
+from app.dependencies import get_openai_client
+from app.services.hashing import shutdown_password_pool
+from app.config import SETTINGS
+from app.services.faiss_search import load_index
 from contextlib import asynccontextmanager
 from functools import lru_cache
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+SERVES_API = SETTINGS.worker_role in ("all", "api")
+SERVES_INGEST = SETTINGS.worker_role in ("all", "ingest")
+
+def preload_dependencies():
+    """Pay the heavy imports up front so the first request doesn't.
+
+    The PDF/OCR stacks are only preloaded on dedicated ingest workers; with the
+    "all" role they load on the first upload, keeping reviewer workers lean.
+    """
+    get_openai_client()
+    import numpy
+    import faiss
+    if SERVES_API and os.path.exists(SETTINGS.index_file) and os.path.exists(SETTINGS.chunks_file):
+        # A bad index must not keep the worker from booting; /reviewer/ask
+        # retries the load and reports the error per request.
+        try:
+            load_index()
+        except Exception:
+            logger.exception("Could not preload FAISS index %s", SETTINGS.index_file)
+    if SETTINGS.worker_role == "ingest":
+        import pdfplumber
+        import PyPDF2
+        import pdf2image
+        import pytesseract
 
 # Initialize database using lifespan
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_db_and_tables()
+    if SERVES_API:
+        await create_db_and_tables()
+    if SETTINGS.preload_on_startup:
+        preload_dependencies()
     yield
+    shutdown_password_pool()
 
 app = FastAPI(title="AI Reviewer Assistant")
 
@@ -19,8 +56,13 @@ async def root():
     return { "message": "Hello World" }
 
 # Register routers
-app.include_router(auth.router)
-# app.include_router(seed.router)
-app.include_router(users.router)
-app.include_router(reviewer.router)
-app.include_router(upload.router)
+if SERVES_API:
+    from app.routers import auth, reviewer, users
+    app.include_router(auth.router)
+    # app.include_router(seed.router)
+    app.include_router(users.router)
+    app.include_router(reviewer.router)
+if SERVES_INGEST:
+    from app.routers import upload
+    app.include_router(upload.router)
+app.include_router(metrics.router)
@@ -15,6 +15,6 @@ class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
     full_name: Optional[str] = None
-    email: Optional[str] = None
+    email: Optional[str] = Field(default=None, index=True)
     hashed_password: str
     scopes: List[str] = Field(default_factory=list, sa_column=Column(ARRAY(String)))
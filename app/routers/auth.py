@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import select
 from app.database import get_session
-from app.dependencies import verify_password, create_access_token
+from app.dependencies import create_access_token
+from app.services.hashing import verify_password_async
 from app.models import User, Token
 from typing import Annotated
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -18,7 +19,7 @@ async def login_for_access_token(
 ) -> Token:
     result = await session.exec(select(User).where(User.username == form_data.username))
     user = result.first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
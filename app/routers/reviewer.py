@@ -6,6 +6,7 @@ from app.services.generator import generate_response
 from typing import Annotated
 from app.models import User
 from app.dependencies import get_current_user
+from app.services.metrics import track_stage
 import json
 import random
 
@@ -20,10 +21,14 @@ async def ask_question(
     payload: QueryRequest
 ):
     try:
-        embedding = embed_text(payload.question)
-        searcher = VectorSearch(dim=1536)
-        relevant_chunks = searcher.search(embedding)
-        answer = generate_response(payload.question, relevant_chunks)
+        with track_stage("ask", "embed"):
+            embedding = embed_text(payload.question)
+        with track_stage("ask", "index_load"):
+            searcher = VectorSearch(dim=1536)
+        with track_stage("ask", "search"):
+            relevant_chunks = searcher.search(embedding)
+        with track_stage("ask", "generate"):
+            answer = generate_response(payload.question, relevant_chunks)
         return {
             "answer": answer,
             "source": "reviewer" if relevant_chunks else "fallback",
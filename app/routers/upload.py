@@ -1,27 +1,26 @@
 # app/routers/upload.py
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from PyPDF2 import PdfReader  # or PyPDF2/PdfReader depending on your package
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
 import json
 import hashlib
 import os
 import re
 import tempfile
-import faiss
-import numpy as np
-from openai import OpenAI  # using the same client you already used elsewhere
+from typing import TYPE_CHECKING
 from app.config import SETTINGS
 from app.dependencies import get_openai_client
+from app.services.metrics import track_stage, record_token_usage, record_index_size
+from app.services.faiss_search import write_index_atomic
+
+# The PDF/OCR stacks, faiss and numpy are imported inside the functions that use
+# them, so workers that never ingest do not pay their import time and memory.
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Output files
 CHUNKS_NLE_FILE = SETTINGS.chunks_path + "/chunks_nle.json"
 INDEX_NLE_PATH = SETTINGS.index_path + "index_nle.faiss"
 
 router = APIRouter(prefix="/upload", tags=["Upload PDF"])
-openai_client = get_openai_client()
 
 # ---------- Utilities ----------
 
@@ -50,6 +49,9 @@ def is_text_pdf(path: str) -> bool:
     Heuristic: try reading pages with pdfplumber or pypdf and see if there's meaningful text.
     If many pages have text -> treat as text-based.
     """
+    import pdfplumber
+    from PyPDF2 import PdfReader
+
     try:
         with pdfplumber.open(path) as pdf:
             non_empty = 0
@@ -76,6 +78,9 @@ def is_text_pdf(path: str) -> bool:
 
 def extract_text_from_pdf(path: str) -> list[str]:
     """Extract per-page text using pdfplumber (best) or pypdf fallback."""
+    import pdfplumber
+    from PyPDF2 import PdfReader
+
     texts = []
     try:
         with pdfplumber.open(path) as pdf:
@@ -93,6 +98,9 @@ def extract_text_via_ocr(path: str, dpi: int = 200, lang: str = "eng") -> list[s
     Convert each page to an image via pdf2image and run pytesseract OCR.
     Returns list of page texts.
     """
+    from pdf2image import convert_from_path
+    import pytesseract
+
     texts = []
     # convert_from_path is CPU/memory heavy; keep DPI moderate
     images = convert_from_path(path, dpi=dpi)
@@ -168,7 +176,7 @@ def parse_inline_mcq(text: str) -> list[dict]:
     return results
 
 # Fallback parser: if regex fails, use the AI to parse the block
-def ai_parse_block_to_structured(block_text: str, openai_client: OpenAI) -> list[dict]:
+def ai_parse_block_to_structured(block_text: str, openai_client: "OpenAI") -> list[dict]:
     """
     Sends the block_text to OpenAI and requests structured JSON back.
     WARNING: costy for many pages — use as fallback.
@@ -193,6 +201,7 @@ If no structured items are found return [].
         ],
         temperature=0
     )
+    record_token_usage("gpt-4o-mini", resp.usage)
     text = resp.choices[0].message.content
     # Attempt to parse JSON out of response — guard aggressively
     try:
@@ -252,8 +261,11 @@ def write_chunks_to_file(new_chunks: list, target_file: str = CHUNKS_NLE_FILE):
             existing_hashes.add(ch["hash"])
             added += 1
 
-    with open(target_file, "w") as f:
+    # Replace atomically so workers reloading the chunks never read a partial file
+    tmp_file = f"{target_file}.tmp-{os.getpid()}"
+    with open(tmp_file, "w") as f:
         json.dump(existing, f, indent=2)
+    os.replace(tmp_file, target_file)
     return added
 
 # ---------- FAISS build function reuse ----------
@@ -261,6 +273,9 @@ def build_faiss_index(source_file: str = CHUNKS_NLE_FILE, index_path: str = INDE
     """
     Build FAISS index for 'ask' chunks only - reuse existing function or this version.
     """
+    import faiss
+    import numpy as np
+
     if not os.path.exists(source_file):
         return
     with open(source_file, "r") as f:
@@ -268,12 +283,19 @@ def build_faiss_index(source_file: str = CHUNKS_NLE_FILE, index_path: str = INDE
     texts = [c["content"] for c in chunks if isinstance(c, dict) and c.get("type") == "ask"]
     if not texts:
         return
-    vectors = [openai_client.embeddings.create(input=text, model="text-embedding-ada-002").data[0].embedding for text in texts]
-    dimension = len(vectors[0])
-    index = faiss.IndexFlatL2(dimension)
-    index.add(np.array(vectors).astype("float32"))
-    os.makedirs(os.path.dirname(index_path), exist_ok=True)
-    faiss.write_index(index, index_path)
+    openai_client = get_openai_client()
+    vectors = []
+    with track_stage("ingest", "embed"):
+        for text in texts:
+            resp = openai_client.embeddings.create(input=text, model="text-embedding-ada-002")
+            record_token_usage("text-embedding-ada-002", resp.usage)
+            vectors.append(resp.data[0].embedding)
+    with track_stage("ingest", "index_write"):
+        dimension = len(vectors[0])
+        index = faiss.IndexFlatL2(dimension)
+        index.add(np.array(vectors).astype("float32"))
+        write_index_atomic(index, index_path)
+    record_index_size("nle", index, index_path)
 
 # ---------- Main endpoint ----------
 
@@ -296,27 +318,31 @@ async def upload_nle_pdf(file: UploadFile = File(...), use_ai_fallback: bool = T
 
     try:
         # 1) choose extraction strategy
-        if is_text_pdf(tmp_path):
-            page_texts = extract_text_from_pdf(tmp_path)
+        with track_stage("ingest", "detect"):
+            text_pdf = is_text_pdf(tmp_path)
+        if text_pdf:
+            with track_stage("ingest", "extract_text"):
+                page_texts = extract_text_from_pdf(tmp_path)
         else:
-            page_texts = extract_text_via_ocr(tmp_path)
+            with track_stage("ingest", "ocr"):
+                page_texts = extract_text_via_ocr(tmp_path)
 
         # Normalize/page-wise
         page_texts = [normalize_whitespace(p) for p in page_texts if normalize_whitespace(p)]
 
         structured_chunks = []
-        ai_client = openai_client if use_ai_fallback else None
+        ai_client = get_openai_client() if use_ai_fallback else None
 
         # 2) run parsers per page
         for page_text in page_texts:
-            # Try number-based MCQ parser first
-            mcqs = parse_numbered_mcq_from_text(page_text)
+            # Try number-based MCQ parser first, then the inline MCQ parser
+            with track_stage("ingest", "parse"):
+                mcqs = parse_numbered_mcq_from_text(page_text)
+                inline = parse_inline_mcq(page_text) if not mcqs else None
             if mcqs:
                 structured_chunks.extend(mcqs)
                 continue
 
-            # Try inline MCQ parser
-            inline = parse_inline_mcq(page_text)
             if inline:
                 structured_chunks.extend(inline)
                 continue
@@ -327,17 +353,20 @@ async def upload_nle_pdf(file: UploadFile = File(...), use_ai_fallback: bool = T
 
             # optionally call ai fallback only if configured and if content is long/complex
             if use_ai_fallback and ai_client and len(page_text) > 800:  # tune threshold
-                parsed_by_ai = ai_parse_block_to_structured(page_text, ai_client)
+                with track_stage("ingest", "ai_fallback"):
+                    parsed_by_ai = ai_parse_block_to_structured(page_text, ai_client)
                 if parsed_by_ai:
                     # replace the simple 'ask' with ai parsed items
                     structured_chunks.pop()  # remove last ask
                     structured_chunks.extend(parsed_by_ai)
 
         # 3) deduplicate and add
-        added = write_chunks_to_file(structured_chunks, CHUNKS_NLE_FILE)
+        with track_stage("ingest", "write_chunks"):
+            added = write_chunks_to_file(structured_chunks, CHUNKS_NLE_FILE)
 
         # 4) rebuild faiss index (ask chunks)
-        build_faiss_index(CHUNKS_NLE_FILE, INDEX_NLE_PATH)
+        with track_stage("ingest", "build_index"):
+            build_faiss_index(CHUNKS_NLE_FILE, INDEX_NLE_PATH)
 
         return {"message": f"Processed upload. chunks parsed: {len(structured_chunks)}, added: {added}"}
 
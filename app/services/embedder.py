@@ -1,5 +1,6 @@
 from app.dependencies import get_openai_client
 from app.config import SETTINGS
+from app.services.metrics import record_token_usage
 
 def embed_text(text: str):
     client = get_openai_client()
@@ -7,4 +8,5 @@ def embed_text(text: str):
         model=SETTINGS.embedding_model,
         input=[text]
     )
+    record_token_usage(SETTINGS.embedding_model, response.usage)
     return response.data[0].embedding
\ No newline at end of file
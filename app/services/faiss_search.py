@@ -1,18 +1,88 @@
-import faiss
-import numpy as np
 import json
+import os
+import tempfile
+import threading
 from app.config import SETTINGS
+from app.services.metrics import record_cache, record_index_size
+
+# Loaded indexes keyed by (index_file, chunks_file). Each entry remembers the
+# files' inode/mtime/size, so an index published by rename is picked up on the
+# next request without restarting the worker.
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_index(path: str):
+    import faiss
+
+    if not SETTINGS.index_mmap:
+        return faiss.read_index(path)
+    # IO_FLAG_MMAP_IFC maps flat (IndexFlatCodes) storage straight from the file,
+    # so every worker shares the same page-cache pages instead of a private copy.
+    # Older faiss builds only have IO_FLAG_MMAP, which covers IVF lists.
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    return faiss.read_index(path, mmap_flag | faiss.IO_FLAG_READ_ONLY)
+
+
+def load_index(index_file: str = None, chunks_file: str = None):
+    """Return (index, chunks), reusing the loaded copy while the files are unchanged."""
+    index_file = index_file or SETTINGS.index_file
+    chunks_file = chunks_file or SETTINGS.chunks_file
+    key = (index_file, chunks_file)
+    signature = (_file_signature(index_file), _file_signature(chunks_file))
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached and cached[0] == signature:
+            record_cache("faiss_index", True)
+            return cached[1], cached[2]
+        record_cache("faiss_index", False)
+        index = _read_index(index_file)
+        with open(chunks_file) as f:
+            chunks = json.load(f)
+        _index_cache[key] = (signature, index, chunks)
+    record_index_size("reviewer", index, index_file)
+    return index, chunks
+
+
+def write_index_atomic(index, index_path: str):
+    """
+    Write the index next to its destination and rename it into place.
+    Readers holding the old file keep a valid mapping of the old inode; new
+    loads see the complete new file, never a partially written one.
+    """
+    import faiss
+
+    directory = os.path.dirname(index_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".faiss.tmp")
+    os.close(fd)
+    try:
+        faiss.write_index(index, tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class VectorSearch:
     def __init__(self, dim: int):
-        self.index = faiss.read_index(SETTINGS.index_path)
-        with open(SETTINGS.chunks_file) as f:
-            self.chunks = json.load(f)
+        self.index, self.chunks = load_index()
 
     def search(self, query_embedding, top_k=3, score_threshold=0.75):
+        import numpy as np
+
         D, I = self.index.search(np.array([query_embedding]).astype('float32'), top_k)
         top_chunks = []
         for i, score in zip(I[0], D[0]):
-            if i != 1 and score < score_threshold:
+            if i != -1 and score < score_threshold:
                 top_chunks.append(self.chunks[i])
-        return top_chunks
\ No newline at end of file
+        return top_chunks
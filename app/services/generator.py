@@ -1,5 +1,6 @@
 from app.dependencies import get_openai_client
 from app.config import SETTINGS
+from app.services.metrics import record_token_usage
 
 def generate_response(user_query: str, context_chunks: list):
     if context_chunks:
@@ -25,4 +26,5 @@ This topic wasn't found in the provided reviewer materials. Please provide a gen
         messages=[{"role": "user", "content": prompt}],
         temperature=0.4
     )
+    record_token_usage(SETTINGS.gpt_model, response.usage)
     return response.choices[0].message.content.strip()
\ No newline at end of file
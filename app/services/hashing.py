@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.dependencies import verify_password, get_password_hash
+from app.config import SETTINGS
+from app.services.metrics import (
+    PASSWORD_ACTIVE,
+    PASSWORD_CANCELLED,
+    PASSWORD_COMPLETED,
+    PASSWORD_FAILED,
+    PASSWORD_QUEUE_DEPTH,
+    PASSWORD_REJECTED,
+)
+
+# bcrypt is deliberately slow (hundreds of ms per call) and holds the CPU, so it
+# must never run on the event loop. A small dedicated pool keeps password work
+# from starving /reviewer traffic, and the queue limit sheds load during a
+# login storm instead of letting latency grow without bound.
+_executor = None
+_lock = threading.Lock()
+_JOB_COUNTERS = {"completed": PASSWORD_COMPLETED, "failed": PASSWORD_FAILED, "cancelled": PASSWORD_CANCELLED}
+_stats = {"pending": 0, "running": 0}
+
+
+def _publish_gauges():
+    # Called with _lock held
+    PASSWORD_QUEUE_DEPTH.set(_stats["pending"] - _stats["running"])
+    PASSWORD_ACTIVE.set(_stats["running"])
+
+
+def _tracked(fn, *args):
+    with _lock:
+        _stats["running"] += 1
+        _publish_gauges()
+    try:
+        return fn(*args)
+    finally:
+        with _lock:
+            _stats["running"] -= 1
+            _publish_gauges()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created on first use and again after shutdown_password_pool(), so a
+    # lifespan that has ended (e.g. a closed TestClient) doesn't break later calls.
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=SETTINGS.password_hash_workers,
+                thread_name_prefix="password-hash",
+            )
+        return _executor
+
+
+def _job_done(future):
+    # Runs when the thread job itself finishes (or is cancelled before starting),
+    # not when the awaiting request goes away, so a cancelled request's bcrypt
+    # call keeps counting against the admission bound until it really ends.
+    with _lock:
+        _stats["pending"] -= 1
+        if future.cancelled():
+            outcome = "cancelled"
+        elif future.exception() is not None:
+            outcome = "failed"
+        else:
+            outcome = "completed"
+        _publish_gauges()
+    _JOB_COUNTERS[outcome].inc()
+
+
+async def _run_in_pool(fn, *args, admit: bool = True):
+    executor = _get_executor()
+    with _lock:
+        if admit and _stats["pending"] >= SETTINGS.password_hash_workers + SETTINGS.password_hash_max_queue:
+            PASSWORD_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        _stats["pending"] += 1
+        _publish_gauges()
+    future = executor.submit(_tracked, fn, *args)
+    future.add_done_callback(_job_done)
+    # Cancelling the awaiter cancels the job only if it hasn't started yet
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_pool(get_password_hash, password)
+
+
+# Shared by every bulk request on the event loop, so bulk work never holds more
+# than one job per worker and interactive logins always find room in the queue.
+_bulk_slots = weakref.WeakKeyDictionary()
+
+
+def _bulk_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _bulk_slots:
+        _bulk_slots[loop] = asyncio.Semaphore(SETTINGS.password_hash_workers)
+    return _bulk_slots[loop]
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hash many passwords in parallel. Bulk jobs wait for a free slot instead of
+    going through the 503 admission check, so a login burst slows a batch down
+    rather than failing it part-way.
+    """
+    async def one(password):
+        async with _bulk_semaphore():
+            return await _run_in_pool(get_password_hash, password, admit=False)
+
+    tasks = [asyncio.ensure_future(one(p)) for p in passwords]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def shutdown_password_pool():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_LATENCY = Histogram(
+    "rag_stage_duration_seconds",
+    "Time spent in each stage of the ask and ingest pipelines",
+    ["pipeline", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "Tokens reported in OpenAI API usage",
+    ["model", "kind"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ["cache", "result"],
+)
+INDEX_VECTORS = Gauge(
+    "faiss_index_vectors",
+    "Number of vectors in a FAISS index",
+    ["index"],
+    multiprocess_mode="livemostrecent",
+)
+INDEX_BYTES = Gauge(
+    "faiss_index_bytes",
+    "Size of a FAISS index file on disk",
+    ["index"],
+    multiprocess_mode="livemostrecent",
+)
+
+# Password pool metrics are updated by app.services.hashing as jobs move
+# through the pool. livesum adds up the live workers under PROMETHEUS_MULTIPROC_DIR.
+PASSWORD_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password jobs waiting for a worker",
+    multiprocess_mode="livesum",
+)
+PASSWORD_ACTIVE = Gauge(
+    "password_hash_active",
+    "Password jobs currently running",
+    multiprocess_mode="livesum",
+)
+PASSWORD_COMPLETED = Counter(
+    "password_hash_completed",
+    "Password jobs finished successfully",
+)
+PASSWORD_FAILED = Counter(
+    "password_hash_failed",
+    "Password jobs that raised an error",
+)
+PASSWORD_CANCELLED = Counter(
+    "password_hash_cancelled",
+    "Password jobs cancelled before a worker picked them up",
+)
+PASSWORD_REJECTED = Counter(
+    "password_hash_rejected",
+    "Password jobs rejected because the queue was full",
+)
+
+
+def track_stage(pipeline: str, stage: str):
+    """Context manager that records the wall time of a pipeline stage."""
+    return STAGE_LATENCY.labels(pipeline, stage).time()
+
+
+def record_token_usage(model: str, usage):
+    """Count prompt/completion tokens from an OpenAI response `usage` object."""
+    if usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if prompt:
+        OPENAI_TOKENS.labels(model, "prompt").inc(prompt)
+    if completion:
+        OPENAI_TOKENS.labels(model, "completion").inc(completion)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_index_size(name: str, index, path: str = None):
+    INDEX_VECTORS.labels(name).set(index.ntotal)
+    if path and os.path.exists(path):
+        INDEX_BYTES.labels(name).set(os.path.getsize(path))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render metrics in Prometheus text format.
+
+    With several uvicorn workers set PROMETHEUS_MULTIPROC_DIR so every process
+    writes to a shared directory and the scrape aggregates all of them.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
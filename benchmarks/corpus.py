@@ -0,0 +1,120 @@
+"""
+Synthetic reviewer material for benchmarks.
+
+`make_reviewer_pdf` writes a small text-based PDF (no external PDF library
+needed) laid out like the NLE reviewers the upload endpoint expects: numbered
+MCQs with lettered options and an answer line, mixed with knowledge paragraphs.
+`make_ask_chunks` produces an in-memory corpus of 'ask' chunks for index builds.
+"""
+import random
+
+TOPICS = [
+    "Fundamentals of Nursing", "Medical-Surgical Nursing", "Maternal and Child Health",
+    "Community Health Nursing", "Psychiatric Nursing", "Pharmacology",
+]
+WORDS = (
+    "patient assessment airway breathing circulation vital signs dosage infusion "
+    "asepsis wound care hypertension diabetes insulin oxygen saturation pulse "
+    "respiration temperature documentation consent triage prenatal postpartum "
+    "immunization sanitation counseling anxiety delirium medication adverse effect"
+).split()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+
+def make_paragraph(rng: random.Random, sentences: int = 12) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def make_mcq_lines(rng: random.Random, number: int) -> list[str]:
+    lines = [f"{number}. {_sentence(rng, rng.randint(10, 18))[:-1]}?"]
+    for letter in "ABCD":
+        lines.append(f"{letter}. {_sentence(rng, rng.randint(2, 5))}")
+    lines.append(f"Answer: {rng.choice('ABCD')}")
+    return lines
+
+
+def make_ask_chunks(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"content": make_paragraph(rng, 6), "type": "ask", "exam_type": "NLE", "topic": rng.choice(TOPICS)}
+        for _ in range(count)
+    ]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int = 90) -> list[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def write_text_pdf(path: str, pages: list[list[str]]):
+    """Write a minimal PDF with one Helvetica text stream per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 770 Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def make_reviewer_pdf(path: str, pages: int = 10, questions_per_page: int = 5, seed: int = 0):
+    """
+    Write a synthetic reviewer PDF. Even pages hold numbered MCQs, odd pages
+    hold knowledge paragraphs (which become 'ask' chunks on ingest).
+    """
+    rng = random.Random(seed)
+    page_lines, number = [], 1
+    for p in range(pages):
+        if p % 2 == 0:
+            lines = []
+            for _ in range(questions_per_page):
+                for line in make_mcq_lines(rng, number):
+                    lines.extend(_wrap(line))
+                number += 1
+        else:
+            lines = _wrap(make_paragraph(rng, 10))
+        page_lines.append(lines[:60])
+    write_text_pdf(path, page_lines)
@@ -0,0 +1,134 @@
+"""
+Local stand-in for the OpenAI embeddings and chat-completions endpoints.
+
+Vectors and answers are derived from a hash of the input, so repeated runs
+produce identical indexes and responses. `latency_ms` adds a fixed delay per
+call to approximate network/API time without paying for live requests.
+
+    python -m benchmarks.openai_stub --port 8765 --latency-ms 50
+"""
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+DEFAULT_DIM = 1536
+
+
+def fake_embedding(text: str, dim: int = DEFAULT_DIM) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vec = np.random.default_rng(seed).standard_normal(dim).astype("float32")
+    return vec / np.linalg.norm(vec)
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text.split()))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.server.latency_ms / 1000)
+
+        if self.path.endswith("/embeddings"):
+            payload = self._embeddings(body)
+        elif self.path.endswith("/chat/completions"):
+            payload = self._chat(body)
+        else:
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        self._send(200, payload)
+
+    def _embeddings(self, body: dict) -> dict:
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = []
+        for i, text in enumerate(inputs):
+            vec = fake_embedding(str(text), self.server.dim)
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vec.tobytes()).decode()
+            else:
+                embedding = vec.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        tokens = sum(count_tokens(str(t)) for t in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _chat(self, body: dict) -> dict:
+        messages = body.get("messages", [])
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        if any("JSON" in m.get("content", "") for m in messages if m.get("role") == "system"):
+            content = "[]"
+        else:
+            digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+            content = f"Stub answer {digest}. " + "lorem " * self.server.completion_tokens
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _send(self, code: int, payload: dict):
+        raw = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def start_stub(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0,
+               dim: int = DEFAULT_DIM, completion_tokens: int = 64):
+    """Start the stub in a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), _StubHandler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.dim = dim
+    server.completion_tokens = completion_tokens
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    args = parser.parse_args()
+    server, url = start_stub(args.host, args.port, args.latency_ms, args.dim, args.completion_tokens)
+    print(f"OpenAI stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,360 @@
+"""
+Offline benchmarks for the reviewer API.
+
+Runs the app in-process against a local OpenAI stub (see openai_stub.py), so
+no API key or network access is needed and results are repeatable. Every run
+writes a JSON file tagged with the current git commit; pass an earlier file
+to --compare to see how each metric moved.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios ask --concurrency 1,16,64 --latency-ms 50
+    python -m benchmarks.run --compare benchmarks/results/<old-commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+from benchmarks.corpus import make_ask_chunks, make_reviewer_pdf
+from benchmarks.openai_stub import start_stub
+
+SCENARIOS = ("startup", "ask", "ingest", "index_build")
+HEAVY_MODULES = ("openai", "numpy", "faiss", "pdfplumber", "PyPDF2", "pdf2image", "pytesseract", "PIL")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def configure_env(workdir: Path, base_url: str):
+    """Point the app at the stub and a scratch data directory. Must run before importing app.*"""
+    (workdir / "faiss_index").mkdir(parents=True, exist_ok=True)
+    os.environ.update({
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": base_url,
+        "INDEX_PATH": f"{workdir}/faiss_index/",
+        "INDEX_FILE": f"{workdir}/faiss_index/index.faiss",
+        "CHUNKS_FILE": f"{workdir}/chunks.json",
+        "CHUNKS_PATH": str(workdir),
+    })
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRES_MINUTES", "30")
+    # The engine is created at import time but never connects: ASGITransport
+    # does not run the lifespan hook and auth is overridden below.
+    os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@localhost/bench")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def latency_summary(samples: list[float]) -> dict:
+    arr = np.array(samples) * 1000
+    if not len(arr):
+        return {}
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def stage_snapshot() -> dict:
+    from app.services.metrics import STAGE_LATENCY
+
+    snap = {}
+    for metric in STAGE_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.name.endswith(("_sum", "_count")):
+                key = f"{sample.labels['pipeline']}.{sample.labels['stage']}"
+                snap.setdefault(key, {})[sample.name.rsplit("_", 1)[1]] = sample.value
+    return snap
+
+
+def stage_means(before: dict, after: dict) -> dict:
+    """Mean milliseconds per stage for the calls made between two snapshots."""
+    out = {}
+    for key, cur in after.items():
+        prev = before.get(key, {})
+        count = cur.get("count", 0) - prev.get("count", 0)
+        if count:
+            out[key] = round((cur.get("sum", 0) - prev.get("sum", 0)) / count * 1000, 3)
+    return out
+
+
+# ---------- Scenarios ----------
+
+async def run_ask(args, workdir: Path) -> list[dict]:
+    import httpx
+    from app.main import app
+    from app.dependencies import get_current_user
+    from app.models import User
+    from app.routers.upload import build_faiss_index
+    from app.config import SETTINGS
+
+    corpus = make_ask_chunks(args.corpus_size)
+    with open(SETTINGS.chunks_file, "w") as f:
+        json.dump(corpus, f)
+    build_faiss_index(SETTINGS.chunks_file, SETTINGS.index_file)
+
+    bench_user = User(username="bench", hashed_password="", scopes=["admin"])
+    app.dependency_overrides[get_current_user] = lambda: bench_user
+
+    # Stub embeddings are hash-derived, so only text identical to an indexed
+    # chunk lands within the score threshold. Hits reuse chunk contents
+    # verbatim; misses are unrelated text that takes the fallback path.
+    rng = random.Random(1)
+    misses = [c["content"] for c in make_ask_chunks(64, seed=1)]
+    questions = [
+        rng.choice(corpus)["content"] if rng.random() < args.hit_ratio else rng.choice(misses)
+        for _ in range(args.requests)
+    ]
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for concurrency in args.concurrency:
+            sem = asyncio.Semaphore(concurrency)
+            latencies, errors = [], 0
+            by_source = {"reviewer": [], "fallback": []}
+
+            async def one(i):
+                nonlocal errors
+                async with sem:
+                    start = time.perf_counter()
+                    resp = await client.post("/reviewer/ask", json={"question": questions[i]})
+                    elapsed = time.perf_counter() - start
+                    latencies.append(elapsed)
+                    if resp.status_code != 200:
+                        errors += 1
+                    else:
+                        by_source[resp.json()["source"]].append(elapsed)
+
+            before = stage_snapshot()
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.requests)))
+            elapsed = time.perf_counter() - start
+            results.append({
+                "name": f"ask c={concurrency}",
+                "concurrency": concurrency,
+                "requests": args.requests,
+                "errors": errors,
+                "hits": len(by_source["reviewer"]),
+                "fallbacks": len(by_source["fallback"]),
+                "throughput_rps": round(args.requests / elapsed, 3),
+                "latency_ms": latency_summary(latencies),
+                "hit_latency_ms": latency_summary(by_source["reviewer"]),
+                "fallback_latency_ms": latency_summary(by_source["fallback"]),
+                "stage_mean_ms": stage_means(before, stage_snapshot()),
+            })
+    app.dependency_overrides.clear()
+    return results
+
+
+async def run_ingest(args, workdir: Path) -> list[dict]:
+    import httpx
+    from app.main import app
+
+    pdf_dir = workdir / "pdfs"
+    pdf_dir.mkdir(exist_ok=True)
+    paths = []
+    for i in range(args.uploads):
+        path = pdf_dir / f"reviewer_{i}.pdf"
+        make_reviewer_pdf(str(path), pages=args.pages, seed=100 + i)
+        paths.append(path)
+
+    latencies, errors = [], 0
+    before = stage_snapshot()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        for path in paths:
+            t0 = time.perf_counter()
+            with open(path, "rb") as f:
+                resp = await client.post(
+                    "/upload/nle",
+                    params={"use_ai_fallback": str(args.ai_fallback).lower()},
+                    files={"file": (path.name, f, "application/pdf")},
+                )
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                errors += 1
+        elapsed = time.perf_counter() - start
+    return [{
+        "name": "ingest",
+        "uploads": args.uploads,
+        "pages_per_upload": args.pages,
+        "ai_fallback": args.ai_fallback,
+        "errors": errors,
+        "pages_per_s": round(args.uploads * args.pages / elapsed, 3),
+        "latency_ms": latency_summary(latencies),
+        "stage_mean_ms": stage_means(before, stage_snapshot()),
+    }]
+
+
+async def run_index_build(args, workdir: Path) -> list[dict]:
+    from app.routers.upload import build_faiss_index
+
+    results = []
+    for size in args.index_sizes:
+        source = workdir / f"index_build_{size}.json"
+        target = workdir / "faiss_index" / f"index_build_{size}.faiss"
+        with open(source, "w") as f:
+            json.dump(make_ask_chunks(size, seed=size), f)
+        before = stage_snapshot()
+        start = time.perf_counter()
+        build_faiss_index(str(source), str(target))
+        elapsed = time.perf_counter() - start
+        results.append({
+            "name": f"index_build n={size}",
+            "vectors": size,
+            "seconds": round(elapsed, 4),
+            "vectors_per_s": round(size / elapsed, 3),
+            "index_bytes": target.stat().st_size,
+            "stage_mean_ms": stage_means(before, stage_snapshot()),
+        })
+    return results
+
+
+STARTUP_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+if {preload}:
+    app.main.preload_dependencies()
+ready = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": imported,
+    "ready_s": ready,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+async def run_startup(args, workdir: Path) -> list[dict]:
+    """Cold import of app.main in a fresh interpreter, per worker role and preload setting."""
+    results = []
+    for role in ("all", "api", "ingest"):
+        for preload in (False, True):
+            env = dict(os.environ, WORKER_ROLE=role, PRELOAD_ON_STARTUP=str(preload).lower())
+            code = STARTUP_PROBE.format(preload=preload, heavy=HEAVY_MODULES)
+            runs = []
+            for _ in range(args.startup_runs):
+                out = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+                runs.append(json.loads(out.strip().splitlines()[-1]))
+            results.append({
+                "name": f"startup role={role} preload={str(preload).lower()}",
+                "import_ms": round(float(np.median([r["import_s"] for r in runs])) * 1000, 1),
+                "ready_ms": round(float(np.median([r["ready_s"] for r in runs])) * 1000, 1),
+                "max_rss_mb": round(float(np.median([r["max_rss_mb"] for r in runs])), 1),
+                "loaded_after_import": runs[-1]["loaded"],
+            })
+    return results
+
+
+RUNNERS = {"startup": run_startup, "ask": run_ask, "ingest": run_ingest, "index_build": run_index_build}
+
+
+# ---------- Reporting ----------
+
+def flatten(results: dict) -> dict:
+    flat = {}
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for k, v in value.items():
+                walk(f"{prefix}.{k}", v)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix] = value
+
+    for entries in results["scenarios"].values():
+        for entry in entries:
+            for k, v in entry.items():
+                if k != "name":
+                    walk(f"{entry['name']}.{k}", v)
+    return flat
+
+
+def compare(old: dict, new: dict):
+    before, after = flatten(old), flatten(new)
+    print(f"\n{'metric':<55} {old['meta']['commit']:>12} {new['meta']['commit']:>12} {'change':>9}")
+    for key in sorted(after):
+        if key not in before:
+            continue
+        a, b = before[key], after[key]
+        change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+        print(f"{key:<55} {a:>12.3f} {b:>12.3f} {change:>9}")
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=20, help="simulated OpenAI latency per call")
+    parser.add_argument("--startup-runs", type=int, default=5, help="startup: cold imports per configuration")
+    parser.add_argument("--requests", type=int, default=200, help="ask: requests per concurrency level")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8, 32], help="ask: e.g. 1,8,32")
+    parser.add_argument("--hit-ratio", type=float, default=0.5, help="ask: share of questions that match an indexed chunk")
+    parser.add_argument("--corpus-size", type=int, default=500, help="ask: chunks in the searched index")
+    parser.add_argument("--uploads", type=int, default=5, help="ingest: number of PDFs uploaded")
+    parser.add_argument("--pages", type=int, default=10, help="ingest: pages per PDF")
+    parser.add_argument("--ai-fallback", action="store_true", help="ingest: enable the AI parsing fallback")
+    parser.add_argument("--index-sizes", type=int_list, default=[100, 1000], help="index_build: e.g. 100,1000")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    server, base_url = start_stub(latency_ms=args.latency_ms)
+    commit = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "scenarios": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="reviewer-bench-") as tmp:
+            workdir = Path(tmp)
+            configure_env(workdir, base_url)
+            for name in scenarios:
+                print(f"running {name} ...", file=sys.stderr)
+                results["scenarios"][name] = asyncio.run(RUNNERS[name](args, workdir))
+    finally:
+        server.shutdown()
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results["scenarios"], indent=2))
+    print(f"\nresults written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()